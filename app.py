@@ -5,44 +5,57 @@ import io
 # Set encoding untuk menghindari error Unicode
 sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
 
+# Batasi thread BLAS/OpenMP/TensorFlow per worker sebelum library numerik dimuat
+import cpu_resources
+
+cpu_resources.configure_environment()
+
 from flask import Flask, render_template, request, jsonify
 import pandas as pd
-import joblib
 from datetime import datetime
 
 # Import CV modules
 try:
     from cv_analysis.leaf_analyzer import LeafAnalyzer
-    from cv_analysis.disease_classifier import DiseaseClassifier
+    # Tidak dipakai langsung (model dimuat oleh ModelRegistry); impor ini memastikan
+    # CV_MODULES_AVAILABLE hanya True jika TensorFlow dapat diimpor
+    from cv_analysis.disease_classifier import DiseaseClassifier  # noqa: F401
     CV_MODULES_AVAILABLE = True
 except ImportError as e:
     print(f"[WARNING] CV modules not available: {e}")
     CV_MODULES_AVAILABLE = False
 
+applied = cpu_resources.configure_libraries()
+print(f"[INFO] Thread per worker: {cpu_resources.get_budget()} ({', '.join(applied) or 'env'})")
+
 app = Flask(__name__)
 
-# Load model ML
-model_path = os.path.join('models', 'yield_model.pkl')
-predictor = None
+# Registry model ML per jenis tanaman
+from model_registry import ModelRegistry
 
-try:
-    if os.path.exists(model_path):
-        predictor = joblib.load(model_path)
-        print("[SUCCESS] Model berhasil dimuat")
-    else:
-        print("[WARNING] File model tidak ditemukan")
-except Exception as e:
-    print(f"[ERROR] Error memuat model: {e}")
-    predictor = None
+model_registry = ModelRegistry(os.environ.get('MODEL_MANIFEST', os.path.join('models', 'manifest.json')))
+
+# Warm-up model di latar belakang: validasi artifact dan forward pass dummy.
+# Worker baru menerima traffic dari load balancer setelah /readyz bernilai 200.
+from warmup import WarmupStage
+
+warmup_crops = os.environ.get('WARMUP_CROPS', '')
+warmup_stage = WarmupStage(
+    model_registry,
+    crops='all' if warmup_crops == 'all' else [c for c in warmup_crops.split(',') if c.strip()],
+    strict=os.environ.get('WARMUP_STRICT', '0') == '1'
+)
+if os.environ.get('WARMUP_ENABLED', '1') == '1':
+    warmup_stage.start_background()
+else:
+    warmup_stage.mark_skipped()
 
 # Inisialisasi CV analyzer jika tersedia
 leaf_analyzer = None
-disease_classifier = None
 
 if CV_MODULES_AVAILABLE:
     try:
         leaf_analyzer = LeafAnalyzer()
-        disease_classifier = DiseaseClassifier()
         print("[SUCCESS] CV modules berhasil dimuat")
     except Exception as e:
         print(f"[ERROR] Error memuat CV modules: {e}")
@@ -109,7 +122,12 @@ class HistoricalDataManager:
             print(f"[ERROR] Error menyimpan data historis: {e}")
 
 # Inisialisasi database
-db_manager = HistoricalDataManager()
+db_manager = HistoricalDataManager(os.environ.get('HISTORICAL_DB', 'data/historical.db'))
+
+# Peramalan hasil panen dari data historis
+from forecasting import YieldForecaster
+
+forecaster = YieldForecaster(db_manager.db_path)
 
 @app.route('/')
 def index():
@@ -214,6 +232,35 @@ def process_map_coordinates():
     except Exception as e:
         return f"Error: {str(e)}"
 
+@app.route('/healthz')
+def healthz():
+    return jsonify({"status": "ok"})
+
+@app.route('/readyz')
+def readyz():
+    snapshot = warmup_stage.snapshot()
+    # pid dipakai harness uji beban untuk memastikan semua worker sudah siap
+    snapshot['pid'] = os.getpid()
+    return jsonify(snapshot), 200 if snapshot['ready'] else 503
+
+@app.route('/models/status')
+def models_status():
+    return jsonify({**model_registry.stats(), "cpu": cpu_resources.describe()})
+
+@app.route('/forecast')
+def forecast():
+    try:
+        jenis_tanaman = request.args.get('jenis_tanaman', 'cabai')
+        musim = request.args.get('musim')
+        horizon = int(request.args.get('horizon', 3))
+    except ValueError:
+        return jsonify({"error": "Parameter horizon harus berupa angka"}), 400
+
+    result = forecaster.forecast(jenis_tanaman, musim=musim, horizon=horizon)
+    if "error" in result:
+        return jsonify(result), 500
+    return jsonify(result)
+
 @app.route('/predict', methods=['POST'])
 def predict():
     try:
@@ -234,7 +281,7 @@ def predict():
             file = request.files['leaf_image']
             if file and file.filename:
                 # Simpan gambar
-                upload_folder = 'uploads'
+                upload_folder = os.environ.get('UPLOAD_FOLDER', 'uploads')
                 if not os.path.exists(upload_folder):
                     os.makedirs(upload_folder)
                 
@@ -249,12 +296,17 @@ def predict():
                     "image_path": filename
                 }
                 
-                # Prediksi penyakit
-                disease_result = disease_classifier.predict_disease(file_path)
+                # Prediksi penyakit dengan model sesuai jenis tanaman
+                disease_classifier, _ = model_registry.get_disease_classifier(jenis_tanaman)
+                if disease_classifier is not None:
+                    disease_result = disease_classifier.predict_disease(file_path)
+                else:
+                    disease_result = {"error": "Model penyakit tidak tersedia"}
         
         # Prediksi hasil panen
         hasil = 0
         model_used = "Fallback (Sederhana)"
+        predictor, model_crop = model_registry.get_yield_model(jenis_tanaman)
         
         if predictor:
             try:
@@ -268,7 +320,7 @@ def predict():
                 # Prediksi
                 prediction = predictor.predict([[pH, n, p, k, cuaca_encoded, musim_encoded]])
                 hasil = prediction[0]
-                model_used = "Machine Learning (ML)"
+                model_used = f"Machine Learning (ML) - {model_crop}"
             except Exception as e:
                 print(f"[ERROR] Error prediksi ML: {e}")
                 hasil = 3.8 if pH < 5.5 else 4.8
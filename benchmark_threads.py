@@ -0,0 +1,79 @@
+# benchmark_threads.py
+import argparse
+
+import cpu_resources
+from run_load_test import run_load_test, parse_mix
+from load_testing.report import save_report, compare_reports
+
+
+def candidate_splits(cores, max_workers=None):
+    """Kombinasi worker x thread yang tidak melebihi jumlah core"""
+    splits = []
+    for workers in range(1, (max_workers or cores) + 1):
+        threads = 1
+        while workers * threads <= cores:
+            splits.append((workers, threads))
+            threads *= 2
+    return splits
+
+
+def run_sweep(requests=300, rate=200.0, seed=42, mix=None, worker_class='sync',
+              max_workers=None, manifest=None, output_dir='reports/thread_sweep'):
+    """
+    Uji setiap pembagian worker x thread dengan beban yang sama dan kembalikan
+    laporan terurut dari throughput tertinggi. Laju kirim sebaiknya di atas
+    kapasitas server agar throughput yang terukur adalah batas atasnya.
+    """
+    cores = cpu_resources.detect_cores()
+    reports = []
+    for workers, threads in candidate_splits(cores, max_workers):
+        label = f"w{workers}xt{threads}"
+        print(f"🔧 Menguji {label} ({cores} core)...")
+        try:
+            report = run_load_test(
+                requests=requests, rate=rate, seed=seed, mix=mix,
+                workers=workers, worker_class=worker_class, manifest=manifest, label=label,
+                env={'CPU_THREADS_PER_WORKER': threads}
+            )
+        except RuntimeError as e:
+            print(f"❌ {label} gagal: {e}")
+            continue
+        save_report(report, output_dir)
+        reports.append(report)
+
+    # Throughput tertinggi, lalu p95 terendah; konfigurasi dengan error diurutkan terakhir
+    reports.sort(key=lambda r: (r['overall']['error_rate'] > 0,
+                                -r['overall']['throughput_rps'],
+                                r['overall']['latency_ms']['p95']))
+    return reports
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cari pembagian worker x thread terbaik untuk mesin ini")
+    parser.add_argument('--requests', type=int, default=300)
+    parser.add_argument('--rate', type=float, default=200.0, help="laju kirim, sebaiknya di atas kapasitas server")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--mix', help="bobot jenis request, contoh: predict=0.7,predict_image=0.3")
+    parser.add_argument('--worker-class', default='sync')
+    parser.add_argument('--max-workers', type=int)
+    parser.add_argument('--manifest', help="manifest model yang dipakai server (MODEL_MANIFEST)")
+    parser.add_argument('--output-dir', default='reports/thread_sweep')
+    args = parser.parse_args()
+
+    reports = run_sweep(
+        requests=args.requests, rate=args.rate, seed=args.seed, mix=parse_mix(args.mix),
+        worker_class=args.worker_class, max_workers=args.max_workers,
+        manifest=args.manifest, output_dir=args.output_dir
+    )
+    if not reports:
+        print("❌ Tidak ada konfigurasi yang berhasil diuji")
+        return
+
+    print(compare_reports(reports))
+    best = reports[0]['config']
+    print(f"✅ Terbaik: WEB_CONCURRENCY={best['workers']} "
+          f"CPU_THREADS_PER_WORKER={best['cpu_threads_per_worker']}")
+
+
+if __name__ == "__main__":
+    main()
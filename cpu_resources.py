@@ -0,0 +1,175 @@
+import os
+import sys
+import math
+
+# Variabel lingkungan yang dibaca pool thread BLAS/OpenMP/TensorFlow saat library dimuat
+THREAD_ENV_VARS = (
+    'OMP_NUM_THREADS',
+    'OPENBLAS_NUM_THREADS',
+    'MKL_NUM_THREADS',
+    'BLIS_NUM_THREADS',
+    'VECLIB_MAXIMUM_THREADS',
+    'NUMEXPR_NUM_THREADS',
+    'TF_NUM_INTRAOP_THREADS',
+    'TF_NUM_INTEROP_THREADS'
+)
+
+_budget = None
+
+
+def _read_file(path):
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def cgroup_cpu_limit():
+    """
+    Batas CPU dari kuota cgroup (docker --cpus, limit CPU Kubernetes), dibulatkan
+    ke atas. None jika tidak ada kuota. Affinity tidak mencerminkan kuota ini.
+    """
+    # cgroup v2: "<kuota> <periode>" atau "max <periode>"
+    value = _read_file('/sys/fs/cgroup/cpu.max')
+    if value:
+        parts = value.split()
+        if len(parts) == 2 and parts[0] != 'max':
+            try:
+                quota, period = int(parts[0]), int(parts[1])
+                if quota > 0 and period > 0:
+                    return max(1, math.ceil(quota / period))
+            except ValueError:
+                pass
+        return None
+
+    # cgroup v1: kuota -1 berarti tidak dibatasi
+    quota = _read_file('/sys/fs/cgroup/cpu/cpu.cfs_quota_us')
+    period = _read_file('/sys/fs/cgroup/cpu/cpu.cfs_period_us')
+    try:
+        quota, period = int(quota), int(period)
+    except (TypeError, ValueError):
+        return None
+    if quota > 0 and period > 0:
+        return max(1, math.ceil(quota / period))
+    return None
+
+
+def detect_cores():
+    """Jumlah core yang boleh dipakai proses ini (affinity/cpuset dan kuota cgroup)"""
+    try:
+        cores = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cores = os.cpu_count() or 1
+    limit = cgroup_cpu_limit()
+    return min(cores, limit) if limit else cores
+
+
+def _env_int(*names, default=1):
+    for name in names:
+        value = os.environ.get(name)
+        if value:
+            try:
+                return max(1, int(value))
+            except ValueError:
+                print(f"[WARNING] Nilai {name} tidak valid: {value!r}, diabaikan")
+    return default
+
+
+def worker_count():
+    """
+    Jumlah worker gunicorn di node ini. GUNICORN_WORKERS diisi hook post_fork
+    di gunicorn.conf.py dari konfigurasi gunicorn yang sebenarnya (-w, file
+    konfigurasi, WEB_CONCURRENCY); WEB_CONCURRENCY dipakai jika hook tidak berjalan.
+    """
+    return _env_int('GUNICORN_WORKERS', 'WEB_CONCURRENCY')
+
+
+def request_threads():
+    """Jumlah request yang dapat berjalan bersamaan per worker (gunicorn --threads)"""
+    return _env_int('GUNICORN_THREADS')
+
+
+def thread_budget():
+    """Thread per request: CPU_THREADS_PER_WORKER jika diset, selain itu core dibagi rata
+    ke semua worker x thread gunicorn"""
+    override = _env_int('CPU_THREADS_PER_WORKER', default=None)
+    if override:
+        return override
+    return max(1, detect_cores() // (worker_count() * request_threads()))
+
+
+def get_budget():
+    return _budget if _budget is not None else thread_budget()
+
+
+def configure_environment(budget=None):
+    """
+    Set batas thread lewat variabel lingkungan. Harus dipanggil sebelum numpy,
+    pandas, sklearn, OpenCV atau TensorFlow diimpor; nilai yang sudah diset
+    secara eksplisit oleh operator tidak ditimpa.
+    """
+    global _budget
+    _budget = budget or thread_budget()
+    for name in THREAD_ENV_VARS:
+        value = _inter_op_threads(_budget) if name == 'TF_NUM_INTEROP_THREADS' else _budget
+        os.environ.setdefault(name, str(value))
+    return _budget
+
+
+def configure_libraries(budget=None):
+    """Terapkan batas thread ke library yang sudah diimpor (TensorFlow, OpenCV, BLAS)"""
+    budget = budget or get_budget()
+    applied = {}
+
+    if 'tensorflow' in sys.modules:
+        try:
+            import tensorflow as tf
+            tf.config.threading.set_intra_op_parallelism_threads(budget)
+            tf.config.threading.set_inter_op_parallelism_threads(_inter_op_threads(budget))
+            applied['tensorflow'] = budget
+        except RuntimeError as e:
+            # Runtime TensorFlow sudah berjalan; variabel lingkungan tetap berlaku
+            print(f"[WARNING] Thread TensorFlow tidak dapat diubah: {e}")
+
+    if 'cv2' in sys.modules:
+        try:
+            import cv2
+            cv2.setNumThreads(budget)
+            applied['opencv'] = budget
+        except Exception as e:
+            print(f"[WARNING] Thread OpenCV tidak dapat diubah: {e}")
+
+    try:
+        from threadpoolctl import threadpool_limits
+        threadpool_limits(limits=budget)
+        applied['blas'] = budget
+    except ImportError:
+        pass
+
+    return applied
+
+
+def configure_estimator(model, budget=None):
+    """Samakan n_jobs estimator sklearn dengan budget worker"""
+    if hasattr(model, 'n_jobs'):
+        try:
+            model.n_jobs = budget or get_budget()
+        except Exception as e:
+            print(f"[WARNING] n_jobs model tidak dapat diubah: {e}")
+    return model
+
+
+def describe():
+    return {
+        "cores": detect_cores(),
+        "workers": worker_count(),
+        "request_threads": request_threads(),
+        "threads_per_worker": get_budget(),
+        "env": {name: os.environ.get(name) for name in THREAD_ENV_VARS}
+    }
+
+
+def _inter_op_threads(budget):
+    # Inference satu request jarang punya operasi paralel independen
+    return 1 if budget < 4 else 2
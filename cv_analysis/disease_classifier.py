@@ -7,10 +7,15 @@ from tensorflow.keras.models import Model
 import os
 
 class DiseaseClassifier:
-    def __init__(self, model_path='models/leaf_disease_model.h5'):
+    DEFAULT_CLASS_NAMES = ['Healthy', 'Bacterial Blight', 'Leaf Spot', 'Powdery Mildew', 'Root Rot']
+
+    def __init__(self, model_path='models/leaf_disease_model.h5', class_names=None, allow_dummy=True):
         self.model_path = model_path
         self.model = None
-        self.class_names = ['Healthy', 'Bacterial Blight', 'Leaf Spot', 'Powdery Mildew', 'Root Rot']
+        # allow_dummy=False: jika model gagal dimuat, self.model tetap None dan
+        # file model tidak ditimpa dengan model dummy
+        self.allow_dummy = allow_dummy
+        self.class_names = list(class_names) if class_names else list(self.DEFAULT_CLASS_NAMES)
         self.load_model()
 
     def load_model(self):
@@ -22,10 +27,13 @@ class DiseaseClassifier:
             else:
                 print("[WARNING] File model tidak ditemukan")
                 # Buat model dummy jika tidak ada
-                self.create_dummy_model()
+                if self.allow_dummy:
+                    self.create_dummy_model()
         except Exception as e:
             print(f"[ERROR] Error memuat model: {e}")
-            self.create_dummy_model()
+            self.model = None
+            if self.allow_dummy:
+                self.create_dummy_model()
 
     def create_dummy_model(self):
         """Buat model dummy untuk testing"""
@@ -39,7 +47,7 @@ class DiseaseClassifier:
         x = base_model.output
         x = GlobalAveragePooling2D()(x)
         x = tf.keras.layers.Dropout(0.2)(x)
-        predictions = Dense(5, activation='softmax')(x)
+        predictions = Dense(len(self.class_names), activation='softmax')(x)
         
         self.model = Model(inputs=base_model.input, outputs=predictions)
         
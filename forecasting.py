@@ -0,0 +1,273 @@
+import sqlite3
+import threading
+from datetime import date
+
+import numpy as np
+
+
+class YieldForecaster:
+    """
+    Peramalan hasil panen per jenis tanaman dan musim dari data historis.
+
+    Agregat bulanan (jumlah, total, total kuadrat) disimpan di tabel
+    yield_aggregates dan diperbarui oleh trigger SQLite setiap kali ada insert
+    ke historical_data, sehingga peramalan tidak perlu membaca ulang seluruh
+    riwayat. Hasil peramalan di-cache sampai versi data tanaman tersebut berubah.
+    """
+
+    def __init__(self, db_path='data/historical.db', min_points=2):
+        self.db_path = db_path
+        self.min_points = min_points
+        self._lock = threading.Lock()
+        self._cache = {}  # (tanaman, musim, horizon) -> (versi, hasil)
+        self.init_aggregates()
+
+    def init_aggregates(self):
+        try:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            cursor = conn.cursor()
+
+            # Semua worker gunicorn menjalankan ini bersamaan; BEGIN IMMEDIATE
+            # memastikan hanya satu worker yang membuat skema dan mengisi agregat
+            conn.isolation_level = None
+            cursor.execute('BEGIN IMMEDIATE')
+            try:
+                cursor.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'forecast_versions'")
+                if cursor.fetchone() is None:
+                    self._create_schema(cursor)
+                cursor.execute('COMMIT')
+            except Exception:
+                cursor.execute('ROLLBACK')
+                raise
+            finally:
+                conn.close()
+        except Exception as e:
+            print(f"[ERROR] Error membuat agregat peramalan: {e}")
+
+    def _create_schema(self, cursor):
+        # Baris tanpa tanggal berformat YYYY-MM atau tanpa hasil panen tidak diagregasi
+        valid = {
+            row: f'''{row}.hasil_kg IS NOT NULL
+                AND substr({row}.tanggal, 1, 7) GLOB '[0-9][0-9][0-9][0-9]-[0-9][0-9]'
+                AND CAST(substr({row}.tanggal, 6, 2) AS INTEGER) BETWEEN 1 AND 12'''
+            for row in ('NEW', 'OLD', 'historical_data')
+        }
+        crop = "lower(trim(coalesce({row}.jenis_tanaman, '')))"
+        season = "lower(trim(coalesce({row}.musim, '')))"
+
+        # Agregat dari skema lama (satu versi global) dibangun ulang
+        for statement in (
+            'DROP TRIGGER IF EXISTS trg_yield_aggregates_insert',
+            'DROP TRIGGER IF EXISTS trg_yield_aggregates_delete',
+            'DROP TABLE IF EXISTS yield_aggregates',
+            'DROP TABLE IF EXISTS forecast_meta',
+            '''
+                CREATE TABLE yield_aggregates (
+                    jenis_tanaman TEXT,
+                    musim TEXT,
+                    periode TEXT,
+                    jumlah INTEGER,
+                    total REAL,
+                    total_kuadrat REAL,
+                    PRIMARY KEY (jenis_tanaman, musim, periode)
+                )
+            ''',
+            '''
+                CREATE TABLE forecast_versions (
+                    jenis_tanaman TEXT PRIMARY KEY,
+                    versi INTEGER
+                )
+            ''',
+            f'''
+                CREATE TRIGGER trg_yield_aggregates_insert
+                AFTER INSERT ON historical_data
+                WHEN {valid['NEW']}
+                BEGIN
+                    INSERT INTO yield_aggregates
+                    VALUES ({crop.format(row='NEW')}, {season.format(row='NEW')},
+                            substr(NEW.tanggal, 1, 7), 1, NEW.hasil_kg, NEW.hasil_kg * NEW.hasil_kg)
+                    ON CONFLICT (jenis_tanaman, musim, periode) DO UPDATE SET
+                        jumlah = jumlah + 1,
+                        total = total + excluded.total,
+                        total_kuadrat = total_kuadrat + excluded.total_kuadrat;
+                    INSERT INTO forecast_versions VALUES ({crop.format(row='NEW')}, 1)
+                    ON CONFLICT (jenis_tanaman) DO UPDATE SET versi = versi + 1;
+                END
+            ''',
+            f'''
+                CREATE TRIGGER trg_yield_aggregates_delete
+                AFTER DELETE ON historical_data
+                WHEN {valid['OLD']}
+                BEGIN
+                    UPDATE yield_aggregates SET
+                        jumlah = jumlah - 1,
+                        total = total - OLD.hasil_kg,
+                        total_kuadrat = total_kuadrat - OLD.hasil_kg * OLD.hasil_kg
+                    WHERE jenis_tanaman = {crop.format(row='OLD')}
+                      AND musim = {season.format(row='OLD')}
+                      AND periode = substr(OLD.tanggal, 1, 7);
+                    DELETE FROM yield_aggregates WHERE jumlah <= 0;
+                    UPDATE forecast_versions SET versi = versi + 1
+                    WHERE jenis_tanaman = {crop.format(row='OLD')};
+                END
+            ''',
+            # Isi agregat sekali dari data yang sudah ada sebelum trigger dibuat
+            f'''
+                INSERT INTO yield_aggregates
+                SELECT {crop.format(row='historical_data')}, {season.format(row='historical_data')},
+                       substr(tanggal, 1, 7), COUNT(*), SUM(hasil_kg), SUM(hasil_kg * hasil_kg)
+                FROM historical_data
+                WHERE {valid['historical_data']}
+                GROUP BY 1, 2, 3
+            ''',
+            '''
+                INSERT OR IGNORE INTO forecast_versions
+                SELECT DISTINCT jenis_tanaman, 0 FROM yield_aggregates
+            '''
+        ):
+            cursor.execute(statement)
+
+    def data_version(self, cursor, jenis_tanaman):
+        """Versi data per tanaman; insert untuk tanaman lain tidak membatalkan cache"""
+        cursor.execute('SELECT versi FROM forecast_versions WHERE jenis_tanaman = ?', (jenis_tanaman,))
+        row = cursor.fetchone()
+        return row[0] if row else 0
+
+    def forecast(self, jenis_tanaman, musim=None, horizon=3):
+        """
+        Ramalkan rata-rata hasil panen bulanan untuk `horizon` bulan ke depan
+        per musim. Mengembalikan dict siap dikirim sebagai JSON.
+        """
+        jenis_tanaman = (jenis_tanaman or '').strip().lower()
+        musim = (musim or '').strip().lower() or None
+        horizon = max(1, min(int(horizon), 24))
+        key = (jenis_tanaman, musim, horizon)
+
+        try:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            version = self.data_version(cursor, jenis_tanaman)
+
+            with self._lock:
+                cached = self._cache.get(key)
+            if cached and cached[0] == version:
+                conn.close()
+                return cached[1]
+
+            query = '''
+                SELECT musim, periode, jumlah, total, total_kuadrat
+                FROM yield_aggregates
+                WHERE jenis_tanaman = ?
+            '''
+            params = [jenis_tanaman]
+            if musim:
+                query += ' AND musim = ?'
+                params.append(musim)
+            cursor.execute(query + ' ORDER BY musim, periode', params)
+            rows = cursor.fetchall()
+            conn.close()
+        except Exception as e:
+            return {"error": f"Error membaca data historis: {str(e)}"}
+
+        try:
+            series = self._forecast_series(rows, horizon)
+        except Exception as e:
+            return {"error": f"Error peramalan: {str(e)}"}
+
+        result = {
+            "jenis_tanaman": jenis_tanaman,
+            "horizon": horizon,
+            "versi_data": version,
+            "musim": series
+        }
+
+        # Hanya kombinasi yang memiliki data yang di-cache agar ukuran cache terbatas
+        if rows:
+            with self._lock:
+                self._cache[key] = (version, result)
+        return result
+
+    def _forecast_series(self, rows, horizon):
+        """Fit tren linear berbobot untuk semua musim sekaligus (tervektorisasi)"""
+        if not rows:
+            return {}
+
+        series = {}
+        for musim, periode, jumlah, total, total_kuadrat in rows:
+            series.setdefault(musim, []).append((self._month_index(periode), jumlah, total, total_kuadrat))
+
+        names = list(series.keys())
+        length = max(len(points) for points in series.values())
+
+        # Matriks (musim x periode), sel kosong diberi bobot nol
+        t = np.zeros((len(names), length))
+        w = np.zeros((len(names), length))
+        y = np.zeros((len(names), length))
+        sq = np.zeros((len(names), length))
+        for row, name in enumerate(names):
+            points = np.array(series[name], dtype=float)
+            n = len(points)
+            t[row, :n] = points[:, 0]
+            w[row, :n] = points[:, 1]
+            y[row, :n] = points[:, 2] / points[:, 1]
+            sq[row, :n] = points[:, 3]
+
+        sw = w.sum(axis=1)
+        mean_t = (w * t).sum(axis=1) / sw
+        mean_y = (w * y).sum(axis=1) / sw
+        dt = np.where(w > 0, t - mean_t[:, None], 0.0)
+        var_t = (w * dt * dt).sum(axis=1)
+        cov_ty = (w * dt * (y - mean_y[:, None])).sum(axis=1)
+
+        points_per_series = (w > 0).sum(axis=1)
+        use_trend = (points_per_series >= self.min_points) & (var_t > 0)
+        slope = np.where(use_trend, cov_ty / np.where(var_t > 0, var_t, 1.0), 0.0)
+        intercept = mean_y - slope * mean_t
+
+        # Simpangan baku dari semua pengamatan individual terhadap garis tren
+        fitted = intercept[:, None] + slope[:, None] * t
+        sse = (sq - 2 * fitted * y * w + fitted * fitted * w).sum(axis=1)
+        dof = sw - np.where(use_trend, 2, 1)
+        confident = (sw >= self.min_points) & (dof > 0)
+        std = np.sqrt(np.maximum(sse, 0) / np.where(dof > 0, dof, 1))
+
+        last_t = np.where(w > 0, t, -np.inf).max(axis=1)
+        steps = np.arange(1, horizon + 1)
+        future_t = last_t[:, None] + steps[None, :]
+        prediction = intercept[:, None] + slope[:, None] * future_t
+
+        # Interval prediksi regresi: 1 + 1/n (+ jarak ke rata-rata waktu jika ada tren)
+        leverage = np.where(use_trend[:, None],
+                            (future_t - mean_t[:, None]) ** 2 / np.where(var_t > 0, var_t, 1.0)[:, None],
+                            0.0)
+        margin = 1.96 * std[:, None] * np.sqrt(1 + 1 / sw[:, None] + leverage)
+
+        result = {}
+        for row, name in enumerate(names):
+            result[name] = {
+                "jumlah_data": int(sw[row]),
+                "tren_per_bulan": round(float(slope[row]), 4),
+                "keyakinan_rendah": not bool(confident[row]),
+                "prediksi": [
+                    {
+                        "periode": self._month_label(int(future_t[row, i])),
+                        "hasil_kg": round(float(max(prediction[row, i], 0)), 2),
+                        "batas_bawah": (round(float(max(prediction[row, i] - margin[row, i], 0)), 2)
+                                        if confident[row] else None),
+                        "batas_atas": (round(float(prediction[row, i] + margin[row, i]), 2)
+                                       if confident[row] else None)
+                    }
+                    for i in range(horizon)
+                ]
+            }
+        return result
+
+    @staticmethod
+    def _month_index(periode):
+        year, month = periode.split('-')[:2]
+        return int(year) * 12 + int(month) - 1
+
+    @staticmethod
+    def _month_label(index):
+        return date(index // 12, index % 12 + 1, 1).strftime('%Y-%m')
@@ -0,0 +1,13 @@
+# gunicorn.conf.py
+# Dimuat otomatis oleh gunicorn dari direktori kerja (juga oleh CMD di Dockerfile).
+import os
+
+
+def post_fork(server, worker):
+    """
+    Teruskan jumlah worker dan thread yang benar-benar dipakai gunicorn ke
+    worker, sebelum app.py diimpor, agar cpu_resources membagi core sesuai
+    konfigurasi (-w, --threads, file konfigurasi atau WEB_CONCURRENCY).
+    """
+    os.environ['GUNICORN_WORKERS'] = str(server.cfg.workers)
+    os.environ['GUNICORN_THREADS'] = str(server.cfg.threads)
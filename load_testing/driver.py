@@ -0,0 +1,199 @@
+import os
+import sys
+import json
+import time
+import shutil
+import tempfile
+import socket
+import subprocess
+import urllib.error
+import urllib.parse
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+
+class GunicornServer:
+    """
+    Menjalankan aplikasi Flask lewat gunicorn lokal selama pengujian beban.
+
+    Dipakai sebagai context manager; server dihentikan saat keluar dari blok.
+    Database historis dan folder upload diarahkan ke direktori sementara
+    (HISTORICAL_DB, UPLOAD_FOLDER) agar request sintetis tidak mengubah data
+    asli dan setiap run dimulai dari kondisi yang sama.
+    """
+
+    def __init__(self, app='app:app', workers=2, worker_class='sync', threads=1,
+                 host='127.0.0.1', port=None, env=None, startup_timeout=180, ready_path='/readyz'):
+        self.app = app
+        self.workers = workers
+        self.worker_class = worker_class
+        self.threads = threads
+        self.host = host
+        self.port = port or self._free_port(host)
+        self.env = env or {}
+        self.startup_timeout = startup_timeout
+        self.ready_path = ready_path
+        self.process = None
+        self.state_dir = None
+
+    @property
+    def base_url(self):
+        return f"http://{self.host}:{self.port}"
+
+    @staticmethod
+    def _free_port(host):
+        with socket.socket() as sock:
+            sock.bind((host, 0))
+            return sock.getsockname()[1]
+
+    def start(self):
+        command = [
+            sys.executable, '-m', 'gunicorn', self.app,
+            '--bind', f"{self.host}:{self.port}",
+            '--workers', str(self.workers),
+            '--worker-class', self.worker_class,
+            '--threads', str(self.threads),
+            '--timeout', '120',
+            '--log-level', 'warning'
+        ]
+        self.state_dir = tempfile.mkdtemp(prefix='agriisensa_load_')
+        env = dict(os.environ)
+        env['HISTORICAL_DB'] = os.path.join(self.state_dir, 'historical.db')
+        env['UPLOAD_FOLDER'] = os.path.join(self.state_dir, 'uploads')
+        env.update({key: str(value) for key, value in self.env.items()})
+        env['WEB_CONCURRENCY'] = str(self.workers)
+        self.process = subprocess.Popen(command, env=env)
+        self.wait_until_ready()
+        return self
+
+    def wait_until_ready(self):
+        """
+        Tunggu sampai setiap worker melaporkan siap. Satu respons 200 hanya
+        berasal dari worker yang kebetulan menjawab, jadi pid dari payload
+        /readyz dikumpulkan sampai jumlahnya sama dengan jumlah worker.
+        """
+        ready_pids = set()
+        deadline = time.time() + self.startup_timeout
+        while time.time() < deadline:
+            if self.process.poll() is not None:
+                self.stop()
+                raise RuntimeError(f"gunicorn berhenti dengan kode {self.process.returncode}")
+            try:
+                with urllib.request.urlopen(self.base_url + self.ready_path, timeout=2) as response:
+                    if response.status == 200:
+                        ready_pids.add(json.loads(response.read()).get('pid'))
+                        if len(ready_pids) >= self.workers:
+                            return
+            except (urllib.error.URLError, OSError, ValueError):
+                pass
+            time.sleep(0.2)
+        self.stop()
+        raise RuntimeError(f"gunicorn tidak siap dalam batas waktu ({len(ready_pids)}/{self.workers} worker siap)")
+
+    def stop(self):
+        if self.process and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+        if self.state_dir:
+            shutil.rmtree(self.state_dir, ignore_errors=True)
+            self.state_dir = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def encode_multipart(fields, files):
+    """Susun body multipart/form-data tanpa dependensi tambahan"""
+    boundary = uuid.uuid4().hex
+    parts = []
+    for name, value in fields.items():
+        parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode())
+    for name, (filename, content, content_type) in files.items():
+        parts.append(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"; filename="{filename}"\r\n'
+            f'Content-Type: {content_type}\r\n\r\n'.encode() + content + b'\r\n'
+        )
+    parts.append(f'--{boundary}--\r\n'.encode())
+    return b''.join(parts), f'multipart/form-data; boundary={boundary}'
+
+
+class LoadDriver:
+    """
+    Mengirim request sintetis dengan laju tetap (open-loop).
+
+    Jadwal kedatangan dihitung di awal, sehingga request yang lambat tidak
+    menurunkan laju kirim dan antrean di server tetap terlihat di latensi.
+    """
+
+    # Aplikasi mengembalikan HTTP 200 berisi pesan error, jadi body juga diperiksa
+    ERROR_MARKERS = (b'<h3>Error', b'Error:')
+
+    def __init__(self, base_url, rate=20.0, concurrency=32, timeout=60):
+        self.base_url = base_url.rstrip('/')
+        self.rate = rate
+        self.concurrency = concurrency
+        self.timeout = timeout
+
+    def run(self, requests):
+        results = [None] * len(requests)
+        interval = 1.0 / self.rate if self.rate > 0 else 0.0
+        started = time.perf_counter()
+
+        def send(index, spec, scheduled):
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            results[index] = self.send(spec, scheduled)
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            for index, spec in enumerate(requests):
+                scheduled = started + index * interval
+                delay = scheduled - time.perf_counter() - 0.005
+                if delay > 0:
+                    time.sleep(delay)
+                executor.submit(send, index, spec, scheduled)
+
+        duration = time.perf_counter() - started
+        return [result for result in results if result is not None], duration
+
+    def send(self, spec, scheduled):
+        if spec.files:
+            body, content_type = encode_multipart(spec.fields, spec.files)
+        elif spec.method == 'POST':
+            body = urllib.parse.urlencode(spec.fields).encode()
+            content_type = 'application/x-www-form-urlencoded'
+        else:
+            body, content_type = None, None
+
+        req = urllib.request.Request(self.base_url + spec.path, data=body, method=spec.method)
+        if content_type:
+            req.add_header('Content-Type', content_type)
+
+        status, error = 0, None
+        try:
+            with urllib.request.urlopen(req, timeout=self.timeout) as response:
+                status = response.status
+                content = response.read()
+                if any(content.lstrip().startswith(marker) for marker in self.ERROR_MARKERS):
+                    error = 'application_error'
+        except urllib.error.HTTPError as e:
+            status, error = e.code, f"http_{e.code}"
+        except Exception as e:
+            error = type(e).__name__
+        finished = time.perf_counter()
+
+        # Latensi diukur dari jadwal kirim, bukan saat thread sempat mengirim
+        return {
+            "kind": spec.kind,
+            "status": status,
+            "error": error,
+            "latency_ms": (finished - scheduled) * 1000
+        }
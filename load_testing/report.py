@@ -0,0 +1,97 @@
+import os
+import json
+import math
+from datetime import datetime
+
+PERCENTILES = (50, 90, 95, 99)
+
+
+def percentile(sorted_values, pct):
+    """Persentil metode nearest-rank dari daftar yang sudah terurut"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(results, duration):
+    """Ringkas throughput, persentil latensi dan tingkat error"""
+    latencies = sorted(result['latency_ms'] for result in results)
+    errors = [result for result in results if result['error']]
+    summary = {
+        "requests": len(results),
+        "duration_s": round(duration, 3),
+        "throughput_rps": round(len(results) / duration, 2) if duration > 0 else 0.0,
+        "error_rate": round(len(errors) / len(results), 4) if results else 0.0,
+        "latency_ms": {f"p{pct}": round(percentile(latencies, pct), 2) for pct in PERCENTILES},
+        "errors": {}
+    }
+    if latencies:
+        summary["latency_ms"]["mean"] = round(sum(latencies) / len(latencies), 2)
+        summary["latency_ms"]["max"] = round(latencies[-1], 2)
+    for result in errors:
+        summary["errors"][result['error']] = summary["errors"].get(result['error'], 0) + 1
+    return summary
+
+
+def build_report(results, duration, config):
+    """Laporan lengkap: konfigurasi, ringkasan total dan per jenis request"""
+    by_kind = {}
+    for result in results:
+        by_kind.setdefault(result['kind'], []).append(result)
+
+    return {
+        "created_at": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        "config": config,
+        "overall": summarize(results, duration),
+        "by_kind": {kind: summarize(items, duration) for kind, items in sorted(by_kind.items())}
+    }
+
+
+def save_report(report, output_dir='reports/load_test'):
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+    config = report['config']
+    name = (f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{config.get('label') or 'run'}"
+            f"_w{config.get('workers')}_{config.get('worker_class')}.json")
+    path = os.path.join(output_dir, name)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    return path
+
+
+def load_report(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def format_report(report):
+    config = report['config']
+    lines = [
+        f"Konfigurasi : {config.get('label') or '-'} | workers={config.get('workers')} "
+        f"class={config.get('worker_class')} threads={config.get('threads')} "
+        f"cpu_threads={config.get('cpu_threads_per_worker', 'auto')} "
+        f"rate={config.get('rate')}/s seed={config.get('seed')}",
+        f"{'jenis':<14}{'req':>7}{'rps':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'error':>8}"
+    ]
+    rows = [('TOTAL', report['overall'])] + list(report['by_kind'].items())
+    for kind, summary in rows:
+        latency = summary['latency_ms']
+        lines.append(f"{kind:<14}{summary['requests']:>7}{summary['throughput_rps']:>9.1f}"
+                     f"{latency['p50']:>9.1f}{latency['p95']:>9.1f}{latency['p99']:>9.1f}"
+                     f"{summary['error_rate'] * 100:>7.1f}%")
+    return '\n'.join(lines)
+
+
+def compare_reports(reports):
+    """Tabel perbandingan beberapa laporan (misal antar worker class atau backend model)"""
+    lines = [f"{'label':<20}{'workers':>8}{'class':>10}{'cpu_thr':>8}{'rps':>9}"
+             f"{'p50':>9}{'p95':>9}{'p99':>9}{'error':>8}"]
+    for report in reports:
+        config, overall = report['config'], report['overall']
+        latency = overall['latency_ms']
+        lines.append(f"{(config.get('label') or '-'):<20}{config.get('workers'):>8}"
+                     f"{config.get('worker_class'):>10}{str(config.get('cpu_threads_per_worker', 'auto')):>8}"
+                     f"{overall['throughput_rps']:>9.1f}{latency['p50']:>9.1f}"
+                     f"{latency['p95']:>9.1f}{latency['p99']:>9.1f}{overall['error_rate'] * 100:>7.1f}%")
+    return '\n'.join(lines)
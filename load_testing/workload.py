@@ -0,0 +1,136 @@
+import math
+import random
+import struct
+import zlib
+
+# Komposisi default lalu lintas (bobot relatif per jenis request)
+DEFAULT_MIX = {
+    "predict": 0.45,
+    "predict_image": 0.15,
+    "area": 0.25,
+    "map": 0.15
+}
+
+CROPS = ['cabai', 'tomat', 'padi', 'jagung', 'bawang merah']
+SEASONS = ['hujan', 'kemarau']
+
+
+class SyntheticRequest:
+    """Satu request HTTP sintetis yang siap dikirim oleh LoadDriver"""
+
+    def __init__(self, kind, method, path, fields=None, files=None):
+        self.kind = kind
+        self.method = method
+        self.path = path
+        self.fields = fields or {}
+        self.files = files or {}  # nama_field -> (nama_file, bytes, content_type)
+
+
+class WorkloadGenerator:
+    """
+    Pembangkit beban kerja sintetis yang deterministik.
+
+    Dengan seed yang sama, urutan request, isi form, poligon dan gambar daun
+    yang dihasilkan selalu identik sehingga hasil antar konfigurasi server
+    dapat dibandingkan.
+    """
+
+    def __init__(self, seed=42, mix=None, image_size=64, max_vertices=40):
+        self.seed = seed
+        self.mix = dict(mix or DEFAULT_MIX)
+        self.image_size = image_size
+        self.max_vertices = max_vertices
+        self.rng = random.Random(seed)
+        self._images = {}
+
+    def generate(self, count):
+        kinds = list(self.mix.keys())
+        weights = [self.mix[kind] for kind in kinds]
+        return [self.build(self.rng.choices(kinds, weights)[0]) for _ in range(count)]
+
+    def build(self, kind):
+        if kind == 'predict':
+            return SyntheticRequest(kind, 'POST', '/predict', fields=self.soil_sample())
+        if kind == 'predict_image':
+            fields = self.soil_sample()
+            name = f"daun_{self.rng.randint(0, 9)}.png"
+            files = {'leaf_image': (name, self.leaf_image(name), 'image/png')}
+            return SyntheticRequest(kind, 'POST', '/predict', fields=fields, files=files)
+        if kind == 'area':
+            coords = self.polygon(self.rng.randint(3, self.max_vertices))
+            return SyntheticRequest(kind, 'POST', '/calculate-area-result',
+                                    fields={'coordinates': self.format_coordinates(coords)})
+        if kind == 'map':
+            coords = self.polygon(self.rng.randint(3, self.max_vertices))
+            return SyntheticRequest(kind, 'POST', '/process-map-coordinates',
+                                    fields={'coordinates': self.format_coordinates(coords)})
+        if kind == 'forecast':
+            path = f"/forecast?jenis_tanaman={self.rng.choice(CROPS)}&horizon={self.rng.randint(1, 6)}"
+            return SyntheticRequest(kind, 'GET', path.replace(' ', '+'))
+        raise ValueError(f"Jenis request tidak dikenal: {kind}")
+
+    def soil_sample(self):
+        """Data tanah dengan sebaran mendekati input petani sebenarnya"""
+        rng = self.rng
+        return {
+            'ph': f"{rng.gauss(6.0, 0.5):.1f}",
+            'n': str(max(0, int(rng.gauss(25, 6)))),
+            'p': str(max(0, int(rng.gauss(15, 5)))),
+            'k': f"{max(0.0, rng.gauss(0.3, 0.06)):.2f}",
+            'cuaca': rng.choice(SEASONS),
+            'musim': rng.choice(SEASONS),
+            'jenis_tanaman': rng.choice(CROPS)
+        }
+
+    def polygon(self, vertices):
+        """Poligon lahan berbentuk bintang tidak beraturan di sekitar Jawa Tengah"""
+        rng = self.rng
+        center_lat = rng.uniform(-7.8, -6.8)
+        center_lon = rng.uniform(109.5, 111.5)
+        radius = rng.uniform(0.0005, 0.01)
+        coords = []
+        for i in range(vertices):
+            angle = 2 * math.pi * i / vertices
+            r = radius * rng.uniform(0.6, 1.0)
+            coords.append((center_lat + r * math.sin(angle), center_lon + r * math.cos(angle)))
+        return coords
+
+    @staticmethod
+    def format_coordinates(coords):
+        return ';'.join(f"{lat:.6f},{lon:.6f}" for lat, lon in coords)
+
+    def leaf_image(self, name):
+        """Gambar PNG daun sintetis; gambar dengan nama sama di-cache"""
+        if name not in self._images:
+            image_rng = random.Random(f"{self.seed}:{name}")
+            self._images[name] = self._render_leaf(image_rng, self.image_size)
+        return self._images[name]
+
+    @staticmethod
+    def _render_leaf(rng, size):
+        # Elips hijau/kuning dengan bercak coklat di atas latar tanah
+        base = (rng.randint(40, 120), rng.randint(120, 200), rng.randint(20, 80))
+        spots = [(rng.uniform(0.3, 0.7) * size, rng.uniform(0.3, 0.7) * size, rng.uniform(1, size / 10))
+                 for _ in range(rng.randint(0, 6))]
+        half = size / 2
+        rows = []
+        for yy in range(size):
+            row = bytearray([0])  # filter PNG: none
+            for xx in range(size):
+                inside = ((xx - half) / (half * 0.9)) ** 2 + ((yy - half) / (half * 0.5)) ** 2 <= 1
+                if not inside:
+                    pixel = (110, 85, 60)
+                elif any((xx - sx) ** 2 + (yy - sy) ** 2 <= sr ** 2 for sx, sy, sr in spots):
+                    pixel = (95, 60, 25)
+                else:
+                    pixel = base
+                row.extend(pixel)
+            rows.append(bytes(row))
+
+        def chunk(tag, data):
+            return (struct.pack('>I', len(data)) + tag + data
+                    + struct.pack('>I', zlib.crc32(tag + data) & 0xffffffff))
+
+        header = struct.pack('>IIBBBBB', size, size, 8, 2, 0, 0, 0)
+        return (b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', header)
+                + chunk(b'IDAT', zlib.compress(b''.join(rows), 9)) + chunk(b'IEND', b''))
@@ -0,0 +1,260 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+
+import joblib
+
+import cpu_resources
+
+DEFAULT_MANIFEST_PATH = os.path.join('models', 'manifest.json')
+
+# Manifest bawaan jika models/manifest.json tidak ada: satu tanaman dengan model lama
+DEFAULT_MANIFEST = {
+    "default_crop": "cabai",
+    "crops": {
+        "cabai": {
+            "yield_model": os.path.join('models', 'yield_model.pkl'),
+            "disease_model": os.path.join('models', 'leaf_disease_model.h5')
+        }
+    }
+}
+
+
+# Signature file model yang valid (placeholder teks dari setup_models.py tidak lolos)
+FORMAT_SIGNATURES = {
+    '.pkl': (b'\x80', b'\x78'),  # pickle protocol >= 2 atau joblib terkompresi zlib
+    '.h5': (b'\x89HDF\r\n\x1a\n',),
+    '.keras': (b'PK\x03\x04',)
+}
+
+CHECKSUM_KEYS = {
+    'yield_model': 'yield_sha256',
+    'disease_model': 'disease_sha256'
+}
+
+
+def file_sha256(path, chunk_size=1024 * 1024):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def validate_artifact(path, expected_sha256=None):
+    """Periksa keberadaan, format dan checksum file model"""
+    result = {"path": path, "valid": False}
+    try:
+        if not os.path.exists(path):
+            result["error"] = "File tidak ditemukan"
+            return result
+
+        signatures = FORMAT_SIGNATURES.get(os.path.splitext(path)[1].lower())
+        with open(path, 'rb') as f:
+            head = f.read(16)
+        if signatures and not any(head.startswith(signature) for signature in signatures):
+            result["error"] = "Format file tidak valid (kemungkinan file placeholder)"
+            return result
+
+        result["sha256"] = file_sha256(path)
+        if expected_sha256 and result["sha256"] != expected_sha256.lower():
+            result["error"] = "Checksum tidak cocok dengan manifest"
+            return result
+
+        result["valid"] = True
+    except Exception as e:
+        result["error"] = f"Error validasi: {str(e)}"
+    return result
+
+
+class ModelRegistry:
+    """
+    Registry model per jenis tanaman.
+
+    Model dimuat saat pertama kali diminta dan disimpan dalam LRU yang dibatasi
+    jumlah model dan perkiraan memori. Tanaman yang jarang dipakai dikeluarkan
+    lebih dulu, sehingga satu worker tidak perlu memuat semua model.
+    """
+
+    def __init__(self, manifest_path=DEFAULT_MANIFEST_PATH, max_models=None, max_memory_mb=None,
+                 retry_after_s=None):
+        self.manifest_path = manifest_path
+        self.max_models = max_models if max_models is not None else int(os.environ.get('MODEL_CACHE_SIZE', 8))
+        if max_memory_mb is None:
+            max_memory_mb = float(os.environ.get('MODEL_CACHE_MB', 1024))
+        self.max_memory_bytes = int(max_memory_mb * 1024 * 1024)
+        if retry_after_s is None:
+            retry_after_s = float(os.environ.get('MODEL_RETRY_SECONDS', 60))
+        self.retry_after_s = retry_after_s
+
+        self._lock = threading.Lock()
+        self._cache = OrderedDict()  # (crop, kind) -> (model, ukuran_bytes)
+        self._memory_bytes = 0
+        self._load_locks = {}
+        # (crop, kind) -> waktu gagal; dicoba ulang setelah retry_after_s agar kegagalan
+        # sementara (misal file sedang diganti saat deploy) tidak permanen
+        self._failed = {}
+        self._artifacts = {}  # (crop, kind) -> hasil validate_artifact saat pemuatan
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "load_errors": 0}
+
+        self.manifest = self.load_manifest()
+        self.default_crop = self.manifest.get('default_crop')
+
+    def load_manifest(self):
+        """Baca manifest model, gunakan manifest bawaan jika tidak tersedia"""
+        try:
+            if os.path.exists(self.manifest_path):
+                with open(self.manifest_path, encoding='utf-8') as f:
+                    manifest = json.load(f)
+                crops = {self.normalize_crop(name): entry
+                         for name, entry in manifest.get('crops', {}).items()}
+                manifest['crops'] = crops
+                if manifest.get('default_crop'):
+                    manifest['default_crop'] = self.normalize_crop(manifest['default_crop'])
+                print(f"[SUCCESS] Manifest model dimuat: {len(crops)} tanaman")
+                return manifest
+            print("[WARNING] Manifest model tidak ditemukan, menggunakan model bawaan")
+        except Exception as e:
+            print(f"[ERROR] Error membaca manifest model: {e}")
+        return json.loads(json.dumps(DEFAULT_MANIFEST))
+
+    @staticmethod
+    def normalize_crop(crop):
+        return (crop or '').strip().lower()
+
+    def crops(self):
+        return sorted(self.manifest['crops'].keys())
+
+    def resolve_crop(self, crop):
+        """Tentukan entri manifest untuk tanaman, kembali ke tanaman default jika tidak dikenal"""
+        crop = self.normalize_crop(crop)
+        if crop in self.manifest['crops']:
+            return crop
+        return self.default_crop
+
+    def get_yield_model(self, crop):
+        """Kembalikan (model, nama_tanaman) untuk prediksi hasil panen"""
+        resolved = self.resolve_crop(crop)
+        return self._get(resolved, 'yield_model'), resolved
+
+    def get_disease_classifier(self, crop):
+        """Kembalikan (DiseaseClassifier, nama_tanaman) untuk deteksi penyakit daun"""
+        resolved = self.resolve_crop(crop)
+        return self._get(resolved, 'disease_model'), resolved
+
+    def _get(self, crop, kind):
+        if crop is None:
+            return None
+        entry = self.manifest['crops'].get(crop, {})
+        if not entry.get(kind):
+            return None
+
+        key = (crop, kind)
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self._stats['hits'] += 1
+                return self._cache[key][0]
+            if self._in_cooldown(key):
+                return None
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+
+        # Pemuatan di luar lock utama agar request tanaman lain tidak ikut tertahan,
+        # lock per model mencegah model yang sama dimuat dua kali
+        with load_lock:
+            with self._lock:
+                if key in self._cache:
+                    self._cache.move_to_end(key)
+                    self._stats['hits'] += 1
+                    return self._cache[key][0]
+                if self._in_cooldown(key):
+                    return None
+                self._stats['misses'] += 1
+
+            model = self._load(key, entry)
+            size = self._estimate_size(entry, kind) if model is not None else 0
+
+            with self._lock:
+                if model is None:
+                    self._failed[key] = time.monotonic()
+                    self._stats['load_errors'] += 1
+                    return None
+                self._failed.pop(key, None)
+                self._cache[key] = (model, size)
+                self._memory_bytes += size
+                self._evict(keep=key)
+                return model
+
+    def _in_cooldown(self, key):
+        failed_at = self._failed.get(key)
+        return failed_at is not None and time.monotonic() - failed_at < self.retry_after_s
+
+    def artifact_info(self, crop, kind):
+        """Hasil validasi artifact terakhir untuk model tanaman, None jika belum dimuat"""
+        with self._lock:
+            info = self._artifacts.get((self.normalize_crop(crop), kind))
+            return dict(info) if info else None
+
+    def _load(self, key, entry):
+        kind = key[1]
+        path = entry[kind]
+        try:
+            # Placeholder atau file dengan checksum berbeda tidak pernah dimuat
+            info = validate_artifact(path, entry.get(CHECKSUM_KEYS[kind]))
+            with self._lock:
+                self._artifacts[key] = info
+            if not info['valid']:
+                print(f"[WARNING] File model tidak valid: {path} ({info['error']})")
+                return None
+            if kind == 'yield_model':
+                model = cpu_resources.configure_estimator(joblib.load(path))
+            else:
+                from cv_analysis.disease_classifier import DiseaseClassifier
+                # Tanpa model dummy: kegagalan load tidak boleh menimpa artifact tanaman
+                model = DiseaseClassifier(model_path=path, class_names=entry.get('disease_classes'),
+                                          allow_dummy=False)
+                if model.model is None:
+                    return None
+            print(f"[SUCCESS] Model dimuat: {path}")
+            return model
+        except Exception as e:
+            print(f"[ERROR] Error memuat model {path}: {e}")
+            return None
+
+    @staticmethod
+    def _estimate_size(entry, kind):
+        """Perkiraan memori model: nilai manifest jika ada, selain itu ukuran file"""
+        memory_mb = entry.get(kind.replace('_model', '_memory_mb'))
+        if memory_mb:
+            return int(float(memory_mb) * 1024 * 1024)
+        try:
+            return os.path.getsize(entry[kind])
+        except OSError:
+            return 0
+
+    def _evict(self, keep):
+        while len(self._cache) > 1 and (len(self._cache) > self.max_models
+                                        or self._memory_bytes > self.max_memory_bytes):
+            key = next(iter(self._cache))
+            if key == keep:
+                break
+            _, size = self._cache.pop(key)
+            self._memory_bytes -= size
+            self._stats['evictions'] += 1
+            print(f"[INFO] Model dikeluarkan dari cache: {key[0]}/{key[1]}")
+
+    def stats(self):
+        with self._lock:
+            return {
+                "crops": self.crops(),
+                "default_crop": self.default_crop,
+                "resident": [f"{crop}/{kind}" for crop, kind in self._cache],
+                "memory_mb": round(self._memory_bytes / (1024 * 1024), 2),
+                "max_memory_mb": round(self.max_memory_bytes / (1024 * 1024), 2),
+                "max_models": self.max_models,
+                "failed": [f"{crop}/{kind}" for crop, kind in sorted(self._failed)],
+                **self._stats
+            }
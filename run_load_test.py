@@ -0,0 +1,102 @@
+# run_load_test.py
+import argparse
+
+from load_testing.workload import WorkloadGenerator, DEFAULT_MIX
+from load_testing.driver import GunicornServer, LoadDriver
+from load_testing.report import build_report, save_report, load_report, format_report, compare_reports
+
+
+def parse_mix(value):
+    """Ubah 'predict=0.5,area=0.5' menjadi dict bobot"""
+    if not value:
+        return dict(DEFAULT_MIX)
+    mix = {}
+    for item in value.split(','):
+        kind, weight = item.split('=')
+        mix[kind.strip()] = float(weight)
+    return mix
+
+
+def run_load_test(requests=500, rate=20.0, seed=42, mix=None, workers=2, worker_class='sync',
+                  threads=1, concurrency=32, warmup_requests=20, manifest=None, env=None,
+                  label=None, url=None):
+    """
+    Jalankan satu skenario beban dan kembalikan laporannya.
+
+    Jika `url` diberikan, request dikirim ke server yang sudah berjalan;
+    jika tidak, gunicorn lokal dijalankan dengan konfigurasi yang diminta.
+    """
+    generator = WorkloadGenerator(seed=seed, mix=mix)
+    warmup = generator.generate(warmup_requests)
+    workload = generator.generate(requests)
+
+    config = {
+        "label": label,
+        "requests": requests,
+        "rate": rate,
+        "seed": seed,
+        "mix": generator.mix,
+        "workers": workers,
+        "worker_class": worker_class,
+        "threads": threads,
+        "cpu_threads_per_worker": (env or {}).get('CPU_THREADS_PER_WORKER', 'auto'),
+        "concurrency": concurrency,
+        "manifest": manifest,
+        "env": env or {},
+        "url": url
+    }
+
+    server_env = dict(env or {})
+    if manifest:
+        server_env['MODEL_MANIFEST'] = manifest
+
+    def drive(base_url):
+        driver = LoadDriver(base_url, rate=rate, concurrency=concurrency)
+        if warmup:
+            driver.run(warmup)
+        return driver.run(workload)
+
+    if url:
+        results, duration = drive(url)
+    else:
+        with GunicornServer(workers=workers, worker_class=worker_class, threads=threads,
+                            env=server_env) as server:
+            results, duration = drive(server.base_url)
+
+    return build_report(results, duration, config)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Uji beban deterministik untuk aplikasi AgriSensa")
+    parser.add_argument('--requests', type=int, default=500, help="jumlah request yang diukur")
+    parser.add_argument('--rate', type=float, default=20.0, help="laju kirim (request/detik)")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--mix', help="bobot jenis request, contoh: predict=0.5,predict_image=0.1,area=0.3,map=0.1")
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--worker-class', default='sync')
+    parser.add_argument('--threads', type=int, default=1)
+    parser.add_argument('--concurrency', type=int, default=32, help="jumlah koneksi klien paralel")
+    parser.add_argument('--warmup-requests', type=int, default=20)
+    parser.add_argument('--manifest', help="manifest model yang dipakai server (MODEL_MANIFEST)")
+    parser.add_argument('--label', help="nama skenario di laporan")
+    parser.add_argument('--url', help="uji server yang sudah berjalan alih-alih menjalankan gunicorn")
+    parser.add_argument('--output-dir', default='reports/load_test')
+    parser.add_argument('--compare', nargs='+', metavar='REPORT', help="bandingkan laporan yang sudah disimpan")
+    args = parser.parse_args()
+
+    if args.compare:
+        print(compare_reports([load_report(path) for path in args.compare]))
+        return
+
+    report = run_load_test(
+        requests=args.requests, rate=args.rate, seed=args.seed, mix=parse_mix(args.mix),
+        workers=args.workers, worker_class=args.worker_class, threads=args.threads,
+        concurrency=args.concurrency, warmup_requests=args.warmup_requests,
+        manifest=args.manifest, label=args.label, url=args.url
+    )
+    print(format_report(report))
+    print(f"📁 Laporan disimpan di: {save_report(report, args.output_dir)}")
+
+
+if __name__ == "__main__":
+    main()
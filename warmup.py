@@ -0,0 +1,189 @@
+# warmup.py
+import os
+import json
+import time
+import argparse
+import threading
+
+import numpy as np
+
+from model_registry import validate_artifact, CHECKSUM_KEYS
+
+YIELD_BATCH_SIZES = (1, 8, 32)
+DISEASE_BATCH_SIZES = (1, 4, 8)
+
+
+class WarmupStage:
+    """
+    Tahap warm-up per worker: validasi artifact model lalu forward pass dummy
+    pada beberapa ukuran batch agar pemuatan model dan tracing TensorFlow
+    terjadi sebelum request pertama. Status dibaca oleh endpoint /readyz.
+
+    Jalankan setelah worker di-fork (jangan gunakan gunicorn --preload),
+    karena thread warm-up tidak ikut tersalin ke proses worker.
+    """
+
+    def __init__(self, registry, crops=None, strict=False):
+        self.registry = registry
+        self.crops = crops
+        self.strict = strict
+        self.status = 'pending'
+        self.artifacts = {}
+        self.errors = []
+        self.duration_s = None
+        self._lock = threading.Lock()
+
+    @property
+    def ready(self):
+        return self.status == 'ready'
+
+    def start_background(self):
+        thread = threading.Thread(target=self.run, name='model-warmup', daemon=True)
+        thread.start()
+        return thread
+
+    def mark_skipped(self):
+        with self._lock:
+            self.status = 'ready'
+            self.duration_s = 0.0
+
+    def run(self):
+        with self._lock:
+            if self.status != 'pending':
+                return
+            self.status = 'running'
+
+        started = time.perf_counter()
+        try:
+            for crop in self.target_crops():
+                self.warm_crop(crop)
+        except Exception as e:
+            with self._lock:
+                self.errors.append(f"Error warm-up: {str(e)}")
+
+        with self._lock:
+            invalid = [name for name, info in self.artifacts.items() if not info.get('valid')]
+            self.duration_s = round(time.perf_counter() - started, 3)
+            self.status = 'failed' if self.strict and (invalid or self.errors) else 'ready'
+
+        if invalid:
+            print(f"[WARNING] Artifact model tidak valid: {', '.join(invalid)}")
+        print(f"[SUCCESS] Warm-up selesai dalam {self.duration_s} detik (status: {self.status})")
+
+    def target_crops(self):
+        if self.crops == 'all':
+            return self.registry.crops()
+        if self.crops:
+            return [self.registry.normalize_crop(crop) for crop in self.crops]
+        return [self.registry.default_crop] if self.registry.default_crop else []
+
+    def warm_crop(self, crop):
+        """Muat dan panaskan model satu tanaman; error tidak menghentikan tanaman lain"""
+        try:
+            entry = self.registry.manifest['crops'].get(crop, {})
+            for kind in CHECKSUM_KEYS:
+                if not entry.get(kind):
+                    continue
+
+                # Validasi format dan checksum dilakukan registry saat memuat model
+                started = time.perf_counter()
+                if kind == 'yield_model':
+                    model, _ = self.registry.get_yield_model(crop)
+                    batches = self.warm_yield_model(model)
+                else:
+                    classifier, _ = self.registry.get_disease_classifier(crop)
+                    batches = self.warm_disease_classifier(classifier)
+
+                info = self.registry.artifact_info(crop, kind) or {"path": entry[kind], "valid": False}
+                if info['valid']:
+                    info['batches'] = batches
+                    info['warmup_s'] = round(time.perf_counter() - started, 3)
+                    if batches is None:
+                        info['valid'] = False
+                        info['error'] = "Model gagal dimuat"
+                else:
+                    info.setdefault('error', "Model gagal dimuat")
+
+                with self._lock:
+                    self.artifacts[f"{crop}/{kind}"] = info
+        except Exception as e:
+            with self._lock:
+                self.errors.append(f"Error warm-up {crop}: {str(e)}")
+
+    @staticmethod
+    def warm_yield_model(model):
+        if model is None:
+            return None
+        # Baris tanah tipikal: pH, N, P, K, cuaca_encoded, musim_encoded
+        sample = [6.0, 25.0, 15.0, 0.3, 0, 0]
+        for batch_size in YIELD_BATCH_SIZES:
+            model.predict([sample] * batch_size)
+        return list(YIELD_BATCH_SIZES)
+
+    @staticmethod
+    def warm_disease_classifier(classifier):
+        if classifier is None or classifier.model is None:
+            return None
+        for batch_size in DISEASE_BATCH_SIZES:
+            dummy = np.zeros((batch_size, 224, 224, 3), dtype=np.float32)
+            classifier.model.predict(dummy, verbose=0)
+        return list(DISEASE_BATCH_SIZES)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "status": self.status,
+                "ready": self.ready,
+                "duration_s": self.duration_s,
+                "artifacts": {name: dict(info) for name, info in self.artifacts.items()},
+                "errors": list(self.errors)
+            }
+
+
+def write_checksums(manifest_path):
+    """Hitung sha256 semua artifact yang valid dan simpan ke manifest"""
+    with open(manifest_path, encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    for crop, entry in manifest.get('crops', {}).items():
+        for kind, checksum_key in CHECKSUM_KEYS.items():
+            path = entry.get(kind)
+            if not path:
+                continue
+            info = validate_artifact(path)
+            if info['valid']:
+                entry[checksum_key] = info['sha256']
+                print(f"✅ {crop}/{kind}: {info['sha256']}")
+            else:
+                entry.pop(checksum_key, None)
+                print(f"❌ {crop}/{kind}: {info['error']}")
+
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=4)
+        f.write('\n')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validasi artifact model AgriSensa")
+    parser.add_argument('--manifest', default=os.path.join('models', 'manifest.json'))
+    parser.add_argument('--write-checksums', action='store_true', help="simpan sha256 artifact ke manifest")
+    args = parser.parse_args()
+
+    if args.write_checksums:
+        write_checksums(args.manifest)
+        return
+
+    with open(args.manifest, encoding='utf-8') as f:
+        manifest = json.load(f)
+    invalid = 0
+    for crop, entry in manifest.get('crops', {}).items():
+        for kind, checksum_key in CHECKSUM_KEYS.items():
+            if entry.get(kind):
+                info = validate_artifact(entry[kind], entry.get(checksum_key))
+                invalid += not info['valid']
+                print(f"{'✅' if info['valid'] else '❌'} {crop}/{kind}: {info.get('error', 'OK')}")
+    raise SystemExit(1 if invalid else 0)
+
+
+if __name__ == "__main__":
+    main()